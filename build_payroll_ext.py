@@ -0,0 +1,19 @@
+import os
+
+from numba.pycc import CC
+
+import payroll_core
+
+# Ahead-of-time build of payroll_core.w2_kernel as the payroll_native extension.
+# When the extension is importable, payroll_core uses it for single paychecks and
+# skips the JIT compile at import, which matters for short-lived processes.
+cc = CC('payroll_native')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export(
+    'w2_kernel',
+    'UniTuple(f8, 8)(f8, f8, f8, f8, f8, f8, f8[:], f8[:], f8, f8, f8, f8, f8)'
+)(payroll_core.w2_kernel.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built payroll_native in {cc.output_dir}")
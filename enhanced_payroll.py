@@ -1,86 +1,52 @@
-import uuid
+import itertools
+import sys
+from bisect import bisect_right
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union
-from enum import Enum
-
-# --- 2024 TAX CONSTANTS ---
-class FilingStatus(Enum):
-    SINGLE = "Single"
-    MARRIED_JOINTLY = "Married Filing Jointly"
-    MARRIED_SEPARATELY = "Married Filing Separately"
-    HEAD_OF_HOUSEHOLD = "Head of Household"
-
-# 2024 Federal Tax Brackets
-FEDERAL_TAX_BRACKETS = {
-    FilingStatus.SINGLE: [
-        {"limit": 11600, "rate": 0.10},
-        {"limit": 47150, "rate": 0.12},
-        {"limit": 100525, "rate": 0.22},
-        {"limit": 191950, "rate": 0.24},
-        {"limit": 243725, "rate": 0.32},
-        {"limit": 609350, "rate": 0.35},
-        {"limit": float('inf'), "rate": 0.37}
-    ],
-    FilingStatus.MARRIED_JOINTLY: [
-        {"limit": 23200, "rate": 0.10},
-        {"limit": 94300, "rate": 0.12},
-        {"limit": 201050, "rate": 0.22},
-        {"limit": 383900, "rate": 0.24},
-        {"limit": 487450, "rate": 0.32},
-        {"limit": 731200, "rate": 0.35},
-        {"limit": float('inf'), "rate": 0.37}
-    ]
-}
-
-# 2024 Standard Deductions
-STANDARD_DEDUCTIONS = {
-    FilingStatus.SINGLE: 14600,
-    FilingStatus.MARRIED_JOINTLY: 29200,
-    FilingStatus.MARRIED_SEPARATELY: 14600,
-    FilingStatus.HEAD_OF_HOUSEHOLD: 21900
-}
-
-# FICA tax rates and limits
-SOCIAL_SECURITY_RATE = 0.062
-MEDICARE_RATE = 0.0145
-ADDITIONAL_MEDICARE_RATE = 0.009
-SOCIAL_SECURITY_WAGE_BASE = 168600
-ADDITIONAL_MEDICARE_THRESHOLD = 200000
-
-# --- EXCEPTIONS ---
-class PayrollError(Exception):
-    """Base exception for payroll-related errors."""
-    pass
-
-class InvalidEmployeeDataError(PayrollError):
-    """Raised when employee data is invalid."""
-    pass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Union
+
+import numpy as np
+
+from payroll_core import (
+    FilingStatus, FEDERAL_TAX_BRACKETS, STANDARD_DEDUCTIONS, FILING_STATUS_IDS, FILING_STATUSES,
+    SOCIAL_SECURITY_RATE, MEDICARE_RATE,
+    ADDITIONAL_MEDICARE_RATE, SOCIAL_SECURITY_WAGE_BASE, ADDITIONAL_MEDICARE_THRESHOLD,
+    PayrollError, InvalidEmployeeDataError, bracket_tables, bracket_tax_lookup, w2_paycheck, get_w2_gufunc
+)
 
 # --- DATA MODELS ---
 
-@dataclass
+# Employee IDs are process-local integers handed out in creation order
+_next_employee_id = itertools.count(1).__next__
+
+@dataclass(frozen=True, slots=True)
 class PreTaxDeductions:
-    """Represents pre-tax deductions."""
+    """Represents pre-tax deductions. Immutable, so the total is computed once."""
     health_insurance: float = 0.0
     dental_insurance: float = 0.0
     retirement_401k: float = 0.0
     hsa: float = 0.0
+    total: float = field(init=False, repr=False, compare=False)
     
-    def total(self) -> float:
-        return self.health_insurance + self.dental_insurance + self.retirement_401k + self.hsa
+    def __post_init__(self):
+        object.__setattr__(
+            self, 'total',
+            self.health_insurance + self.dental_insurance + self.retirement_401k + self.hsa
+        )
 
-@dataclass
+@dataclass(slots=True)
 class Employee:
     """Base class for all employees."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: int = field(default_factory=_next_employee_id)
     name: str = ""
     is_w2: bool = True
+    external_id: str = ""  # Stable identifier (e.g. a UUID) for records shared outside this process
     
     def __post_init__(self):
         if not self.name.strip():
             raise InvalidEmployeeDataError("Employee name cannot be empty")
 
-@dataclass
+@dataclass(slots=True)
 class W2Employee(Employee):
     """Represents a W-2 employee with tax information."""
     pay_rate: float = 0.0
@@ -91,7 +57,8 @@ class W2Employee(Employee):
     is_w2: bool = True
     
     def __post_init__(self):
-        super().__post_init__()
+        # Explicit base call: slots=True rebuilds the class, which breaks zero-argument super()
+        Employee.__post_init__(self)
         if self.pay_rate <= 0:
             raise InvalidEmployeeDataError("Pay rate must be greater than 0")
         if self.allowances < 0:
@@ -99,18 +66,18 @@ class W2Employee(Employee):
         if self.state_tax_rate < 0 or self.state_tax_rate > 1:
             raise InvalidEmployeeDataError("State tax rate must be between 0 and 1")
 
-@dataclass
+@dataclass(slots=True)
 class Contractor(Employee):
     """Represents a 1099 contractor."""
     pay_rate: float = 0.0
     is_w2: bool = False
     
     def __post_init__(self):
-        super().__post_init__()
+        Employee.__post_init__(self)
         if self.pay_rate <= 0:
             raise InvalidEmployeeDataError("Pay rate must be greater than 0")
 
-@dataclass
+@dataclass(slots=True)
 class PaystubResult:
     """Represents the result of a payroll calculation."""
     employee_name: str
@@ -126,14 +93,82 @@ class PaystubResult:
     state_tax: float = 0.0
     total_deductions: float = 0.0
     net_pay: float = 0.0
+    
+    @classmethod
+    def from_row(cls, rows: np.ndarray, i: int, employee_name: str = "") -> "PaystubResult":
+        """Builds a PaystubResult from row i of a PAYSTUB_DTYPE array."""
+        _, is_w2, hours_worked, *amounts = rows[i].item()
+        return cls(
+            employee_name=employee_name,
+            employee_type="W-2 Employee" if is_w2 else "1099 Contractor",
+            hours_worked=hours_worked,
+            **dict(zip(PAYSTUB_AMOUNT_FIELDS, amounts))
+        )
+
+# Row layout of batch payroll output, one packed record per paystub; amount
+# field names match PaystubResult
+PAYSTUB_AMOUNT_FIELDS = (
+    'gross_pay', 'pre_tax_deductions', 'taxable_income', 'federal_tax', 'social_security_tax',
+    'medicare_tax', 'additional_medicare_tax', 'state_tax', 'total_deductions', 'net_pay'
+)
+PAYSTUB_DTYPE = np.dtype(
+    [('employee_id', 'i8'), ('is_w2', '?'), ('hours_worked', 'f8')]
+    + [(name, 'f8') for name in PAYSTUB_AMOUNT_FIELDS]
+)
+
+class PayrollBatch:
+    """Column-oriented (one array per field) view of W-2 employees for batch payroll."""
+
+    def __init__(self, pay_rate: np.ndarray, hours: np.ndarray, pre_tax_total: np.ndarray,
+                 filing_status_id: np.ndarray, allowances: np.ndarray,
+                 state_rate: np.ndarray, ytd: np.ndarray, employee_id: Optional[np.ndarray] = None):
+        self.employee_id = None if employee_id is None else np.asarray(employee_id, dtype=PAYSTUB_DTYPE['employee_id'])
+        self.pay_rate = np.asarray(pay_rate, dtype=np.float64)
+        self.hours = np.asarray(hours, dtype=np.float64)
+        self.pre_tax_total = np.asarray(pre_tax_total, dtype=np.float64)
+        self.filing_status_id = np.asarray(filing_status_id, dtype=np.int8)
+        self.allowances = np.asarray(allowances, dtype=np.int16)
+        self.state_rate = np.asarray(state_rate, dtype=np.float64)
+        self.ytd = np.asarray(ytd, dtype=np.float64)
+
+    @classmethod
+    def from_employees(cls, employees: List[W2Employee], hours: List[float],
+                       ytd: List[float]) -> "PayrollBatch":
+        """Builds a batch from parallel lists of employees, hours worked and YTD earnings."""
+        return cls(
+            pay_rate=[e.pay_rate for e in employees],
+            hours=hours,
+            pre_tax_total=[e.pre_tax_deductions.total for e in employees],
+            filing_status_id=[FILING_STATUS_IDS[e.filing_status] for e in employees],
+            allowances=[e.allowances for e in employees],
+            state_rate=[e.state_tax_rate for e in employees],
+            ytd=ytd,
+            employee_id=[e.id for e in employees]
+        )
+
+    def __len__(self) -> int:
+        return self.pay_rate.size
 
 # --- PAYROLL PROCESSING LOGIC ---
 
+def _round_cents(amounts: np.ndarray) -> np.ndarray:
+    """
+    Rounds an array to cents, agreeing exactly with round(x, 2) on each element.
+    np.round scales by 100 before rounding, and that product can land on the other
+    side of a half cent (101.5 * 25.35 is just above 2573.025, times 100 is exactly
+    257302.5), so entries within float error of a half cent are redone with round.
+    """
+    cents = amounts * 100
+    result = np.round(amounts, 2)
+    near_half = np.abs(np.abs(cents - np.floor(cents)) - 0.5) <= 1e-9 * np.maximum(1.0, np.abs(cents))
+    for i in np.flatnonzero(near_half):
+        result[i] = round(float(amounts[i]), 2)
+    return result
+
 class PayrollCalculator:
     """Enhanced payroll calculator with improved accuracy and features."""
     
     def __init__(self):
-        self.federal_tax_brackets = FEDERAL_TAX_BRACKETS
         self.standard_deductions = STANDARD_DEDUCTIONS
         self.fica_social_security_rate = SOCIAL_SECURITY_RATE
         self.fica_medicare_rate = MEDICARE_RATE
@@ -141,6 +176,68 @@ class PayrollCalculator:
         self.social_security_wage_base = SOCIAL_SECURITY_WAGE_BASE
         self.additional_medicare_threshold = ADDITIONAL_MEDICARE_THRESHOLD
 
+        # Withholding constants are cached per calculator and keyed on the standard
+        # deduction as well, so edits to standard_deductions apply on the next call
+        self._employee_consts_cached = lru_cache(maxsize=None)(self._employee_consts)
+        self._withholding_table_cached = lru_cache(maxsize=None)(self._withholding_table)
+        self.federal_tax_brackets = FEDERAL_TAX_BRACKETS
+
+    @property
+    def federal_tax_brackets(self) -> Dict[FilingStatus, List[Dict]]:
+        return self._federal_tax_brackets
+
+    @federal_tax_brackets.setter
+    def federal_tax_brackets(self, brackets: Dict[FilingStatus, List[Dict]]):
+        # Every withholding path reads tables derived from the brackets, so assigning
+        # new brackets rebuilds them
+        self._federal_tax_brackets = brackets
+        self.clear_caches()
+
+    def clear_caches(self):
+        """
+        Rebuild the bracket tables from federal_tax_brackets and drop cached withholding
+        constants; call after changing the brackets in place. Assigning
+        federal_tax_brackets does this itself.
+        """
+        # Per filing status (upper limits, lower limits, tax at each lower limit, rates)
+        # for the batch lookup; the limit and rate arrays also feed the compiled kernels
+        self._bracket_tables = {
+            fs: bracket_tables(brackets) for fs, brackets in self._federal_tax_brackets.items()
+        }
+        self.bracket_limits = {fs: tables[0] for fs, tables in self._bracket_tables.items()}
+        self.bracket_rates = {fs: tables[3] for fs, tables in self._bracket_tables.items()}
+        self._employee_consts_cached.cache_clear()
+        self._withholding_table_cached.cache_clear()
+
+    def _employee_consts(self, filing_status: FilingStatus, allowances: int,
+                         standard_deduction: float) -> tuple[float, np.ndarray, np.ndarray]:
+        """
+        Returns the per-employee federal withholding constants: the annual deduction
+        (standard deduction plus allowances) and the bracket limits and rates.
+        Keyed on the values themselves, so editing an employee needs no invalidation.
+        """
+        annual_deduction = standard_deduction + allowances * 4700.0
+        return annual_deduction, self.bracket_limits[filing_status], self.bracket_rates[filing_status]
+
+    def _withholding_table(self, filing_status: FilingStatus, allowances: int,
+                           standard_deduction: float) -> tuple[tuple[float, ...], tuple[float, ...], tuple[float, ...]]:
+        """
+        Returns annual federal tax as a piecewise-linear function of annualized taxable
+        income with the annual deduction folded in: segment i starts at offsets[i] and
+        has tax intercepts[i] there, rising at slopes[i]. Income below offsets[0] owes nothing.
+        """
+        annual_deduction, limits, rates = self._employee_consts_cached(
+            filing_status, allowances, standard_deduction
+        )
+        offsets, intercepts = [], []
+        previous_limit = tax = 0.0
+        for limit, rate in zip(limits.tolist(), rates.tolist()):
+            offsets.append(annual_deduction + previous_limit)
+            intercepts.append(tax)
+            tax += (limit - previous_limit) * rate
+            previous_limit = limit
+        return tuple(offsets), tuple(intercepts), tuple(rates.tolist())
+
     def calculate_federal_withholding(self, taxable_income: float, filing_status: FilingStatus, 
                                     allowances: int) -> float:
         """
@@ -150,42 +247,24 @@ class PayrollCalculator:
         # Get annual taxable income (assuming bi-weekly pay)
         annual_taxable = taxable_income * 26
         
-        # Subtract standard deduction
-        standard_deduction = self.standard_deductions[filing_status]
-        annual_taxable_after_deduction = max(0, annual_taxable - standard_deduction)
-        
-        # Subtract allowance amount (simplified - $4,700 per allowance for 2024)
-        allowance_amount = allowances * 4700
-        annual_taxable_final = max(0, annual_taxable_after_deduction - allowance_amount)
-        
-        # Calculate annual tax
-        annual_tax = self._calculate_tax_from_brackets(
-            annual_taxable_final, 
-            self.federal_tax_brackets[filing_status]
+        # The standard deduction and allowances ($4,700 each for 2024) are already
+        # folded into the segment offsets, so one bisect finds the bracket
+        offsets, intercepts, slopes = self._withholding_table_cached(
+            filing_status, allowances, self.standard_deductions[filing_status]
         )
+        i = bisect_right(offsets, annual_taxable) - 1
+        if i < 0:
+            return 0.0
+        annual_tax = intercepts[i] + slopes[i] * (annual_taxable - offsets[i])
         
         # Return per-paycheck withholding
         return annual_tax / 26
 
-    def _calculate_tax_from_brackets(self, income: float, brackets: List[Dict]) -> float:
-        """Calculates tax using progressive tax brackets."""
-        tax = 0.0
-        income_remaining = income
-        previous_limit = 0
-        
-        for bracket in brackets:
-            limit = bracket["limit"]
-            rate = bracket["rate"]
-            
-            taxable_in_bracket = min(income_remaining, limit - previous_limit)
-            tax += taxable_in_bracket * rate
-            
-            income_remaining -= taxable_in_bracket
-            if income_remaining <= 0:
-                break
-            previous_limit = limit
-            
-        return tax
+    def _fica_constants(self) -> tuple[float, float, float, float, float]:
+        """The FICA rates and limits in w2_kernel's argument order, read from the calculator."""
+        return (float(self.social_security_wage_base), float(self.fica_social_security_rate),
+                float(self.fica_medicare_rate), float(self.additional_medicare_threshold),
+                float(self.additional_medicare_rate))
 
     def calculate_fica_taxes(self, gross_pay: float, ytd_earnings: float) -> tuple[float, float, float]:
         """Calculates Social Security, Medicare, and Additional Medicare taxes."""
@@ -196,11 +275,10 @@ class PayrollCalculator:
         # Medicare tax (no wage base limit)
         medicare_tax = gross_pay * self.fica_medicare_rate
         
-        # Additional Medicare tax (0.9% on wages over $200,000)
-        additional_medicare_tax = 0.0
-        if ytd_earnings + gross_pay > self.additional_medicare_threshold:
-            excess_wages = min(gross_pay, (ytd_earnings + gross_pay) - self.additional_medicare_threshold)
-            additional_medicare_tax = excess_wages * self.additional_medicare_rate
+        # Additional Medicare tax (0.9% on wages over $200,000); the clamps are
+        # written without a branch so the same form vectorizes in the batch kernels
+        excess_wages = max(0.0, min(gross_pay, (ytd_earnings + gross_pay) - self.additional_medicare_threshold))
+        additional_medicare_tax = excess_wages * self.additional_medicare_rate
         
         return ss_tax, medicare_tax, additional_medicare_tax
 
@@ -208,48 +286,161 @@ class PayrollCalculator:
         """Simplified state tax calculation."""
         return taxable_income * state_rate
 
+    def process_w2_payroll_batch(self, pay_rates: np.ndarray, hours: np.ndarray,
+                                 pre_tax_totals: np.ndarray, filing_status_ids: np.ndarray,
+                                 allowances: np.ndarray, state_rates: np.ndarray,
+                                 ytd: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Processes W-2 payroll for many employees at once.
+        Every argument is a parallel array with one entry per employee. Unrounded
+        amounts are written into out, a PAYSTUB_DTYPE array (allocated if omitted),
+        which is returned.
+        """
+        pay_rates = np.asarray(pay_rates, dtype=np.float64)
+        hours = np.asarray(hours, dtype=np.float64)
+        pre_tax_totals = np.asarray(pre_tax_totals, dtype=np.float64)
+        filing_status_ids = np.asarray(filing_status_ids, dtype=np.int8)
+        allowances = np.asarray(allowances, dtype=np.int16)
+        state_rates = np.asarray(state_rates, dtype=np.float64)
+        ytd = np.asarray(ytd, dtype=np.float64)
+        if np.any(hours < 0):
+            raise PayrollError("Hours worked cannot be negative")
+
+        gross = pay_rates * hours
+        taxable = np.maximum(0.0, gross - pre_tax_totals)
+
+        # Federal withholding (annualized, assuming bi-weekly pay), one vectorized
+        # bracket lookup per filing status present
+        federal = np.zeros_like(gross)
+        for status_id in np.unique(filing_status_ids):
+            mask = filing_status_ids == status_id
+            filing_status = FILING_STATUSES[status_id]
+            annual_taxable = np.maximum(0.0, taxable[mask] * 26 - self.standard_deductions[filing_status])
+            annual_taxable = np.maximum(0.0, annual_taxable - allowances[mask] * 4700.0)
+            federal[mask] = bracket_tax_lookup(annual_taxable, self._bracket_tables[filing_status]) / 26
+
+        # FICA
+        ss_taxable = np.minimum(gross, np.maximum(0.0, self.social_security_wage_base - ytd))
+        ss_tax = ss_taxable * self.fica_social_security_rate
+        medicare = gross * self.fica_medicare_rate
+        additional_medicare = np.maximum(
+            0.0, np.minimum(gross, ytd + gross - self.additional_medicare_threshold)
+        ) * self.additional_medicare_rate
+
+        state = taxable * state_rates
+
+        total_tax_deductions = federal + ss_tax + medicare + additional_medicare + state
+        total_deductions = pre_tax_totals + total_tax_deductions
+        
+        if out is None:
+            out = np.zeros(gross.size, dtype=PAYSTUB_DTYPE)
+        out['is_w2'] = True
+        out['hours_worked'] = hours
+        out['gross_pay'] = gross
+        out['pre_tax_deductions'] = pre_tax_totals
+        out['taxable_income'] = taxable
+        out['federal_tax'] = federal
+        out['social_security_tax'] = ss_tax
+        out['medicare_tax'] = medicare
+        out['additional_medicare_tax'] = additional_medicare
+        out['state_tax'] = state
+        out['total_deductions'] = total_deductions
+        out['net_pay'] = gross - total_deductions
+        return out
+
+    def process_w2_payroll_vec(self, pay_rates: np.ndarray, hours: np.ndarray,
+                               pre_tax_totals: np.ndarray, filing_status_ids: np.ndarray,
+                               allowances: np.ndarray, state_rates: np.ndarray,
+                               ytd: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Same contract as process_w2_payroll_batch, computed by the compiled parallel
+        kernel when numba is available and by the NumPy batch path otherwise.
+        """
+        w2_gufunc = get_w2_gufunc()
+        if w2_gufunc is None:
+            return self.process_w2_payroll_batch(
+                pay_rates, hours, pre_tax_totals, filing_status_ids, allowances, state_rates, ytd, out
+            )
+        
+        pay_rates = np.asarray(pay_rates, dtype=np.float64)
+        hours = np.asarray(hours, dtype=np.float64)
+        pre_tax_totals = np.asarray(pre_tax_totals, dtype=np.float64)
+        filing_status_ids = np.asarray(filing_status_ids, dtype=np.int8)
+        allowances = np.asarray(allowances, dtype=np.float64)
+        state_rates = np.asarray(state_rates, dtype=np.float64)
+        ytd = np.asarray(ytd, dtype=np.float64)
+        if np.any(hours < 0):
+            raise PayrollError("Hours worked cannot be negative")
+        
+        if out is None:
+            out = np.zeros(pay_rates.size, dtype=PAYSTUB_DTYPE)
+        names = ('gross_pay', 'taxable_income', 'federal_tax', 'social_security_tax',
+                 'medicare_tax', 'additional_medicare_tax', 'state_tax', 'total_deductions')
+        for status_id in np.unique(filing_status_ids):
+            mask = filing_status_ids == status_id
+            filing_status = FILING_STATUSES[status_id]
+            annual_deductions = self.standard_deductions[filing_status] + allowances[mask] * 4700.0
+            outputs = w2_gufunc(
+                pay_rates[mask], hours[mask], pre_tax_totals[mask], annual_deductions,
+                state_rates[mask], ytd[mask], self.bracket_limits[filing_status], self.bracket_rates[filing_status],
+                *self._fica_constants()
+            )
+            for name, values in zip(names, outputs):
+                out[name][mask] = values
+        
+        out['is_w2'] = True
+        out['hours_worked'] = hours
+        out['pre_tax_deductions'] = pre_tax_totals
+        out['net_pay'] = out['gross_pay'] - out['total_deductions']
+        return out
+
+    def process_batch(self, batch: PayrollBatch) -> np.ndarray:
+        """Processes W-2 payroll for every employee in a PayrollBatch into a PAYSTUB_DTYPE array."""
+        out = np.zeros(len(batch), dtype=PAYSTUB_DTYPE)
+        if batch.employee_id is not None:
+            out['employee_id'] = batch.employee_id
+        return self.process_w2_payroll_vec(
+            batch.pay_rate, batch.hours, batch.pre_tax_total, batch.filing_status_id,
+            batch.allowances, batch.state_rate, batch.ytd, out
+        )
+
     def process_w2_payroll(self, employee: W2Employee, hours_worked: float, 
                           ytd_earnings: float = 0.0) -> PaystubResult:
         """Processes payroll for a W-2 employee with enhanced calculations."""
         if hours_worked < 0:
             raise PayrollError("Hours worked cannot be negative")
         
-        gross_pay = hours_worked * employee.pay_rate
-        
-        # Calculate pre-tax deductions
-        pre_tax_total = employee.pre_tax_deductions.total()
-        
-        # Taxable income after pre-tax deductions
-        taxable_income = max(0, gross_pay - pre_tax_total)
-        
-        # Calculate taxes
-        federal_tax = self.calculate_federal_withholding(
-            taxable_income, employee.filing_status, employee.allowances
+        annual_deduction, limits, rates = self._employee_consts_cached(
+            employee.filing_status, employee.allowances, self.standard_deductions[employee.filing_status]
         )
-        ss_tax, medicare_tax, additional_medicare_tax = self.calculate_fica_taxes(
-            gross_pay, ytd_earnings
+        pre_tax_total = float(employee.pre_tax_deductions.total)
+        gross, taxable, federal, ss, medicare, additional_medicare, state, total = w2_paycheck(
+            float(employee.pay_rate), float(hours_worked), pre_tax_total,
+            annual_deduction, float(employee.state_tax_rate), float(ytd_earnings), limits, rates,
+            *self._fica_constants()
         )
-        state_tax = self.calculate_state_tax(taxable_income, employee.state_tax_rate)
         
-        # Calculate totals
-        total_tax_deductions = federal_tax + ss_tax + medicare_tax + additional_medicare_tax + state_tax
-        total_deductions = pre_tax_total + total_tax_deductions
-        net_pay = gross_pay - total_deductions
+        (gross_pay, pre_tax_deductions, taxable_income, federal_tax, ss_tax, medicare_tax,
+         additional_medicare_tax, state_tax, total_deductions, net_pay) = [
+            round(float(amount), 2)
+            for amount in (gross, pre_tax_total, taxable, federal, ss, medicare,
+                           additional_medicare, state, total, gross - total)
+        ]
         
         return PaystubResult(
             employee_name=employee.name,
             employee_type="W-2 Employee",
             hours_worked=hours_worked,
-            gross_pay=round(gross_pay, 2),
-            pre_tax_deductions=round(pre_tax_total, 2),
-            taxable_income=round(taxable_income, 2),
-            federal_tax=round(federal_tax, 2),
-            social_security_tax=round(ss_tax, 2),
-            medicare_tax=round(medicare_tax, 2),
-            additional_medicare_tax=round(additional_medicare_tax, 2),
-            state_tax=round(state_tax, 2),
-            total_deductions=round(total_deductions, 2),
-            net_pay=round(net_pay, 2)
+            gross_pay=gross_pay,
+            pre_tax_deductions=pre_tax_deductions,
+            taxable_income=taxable_income,
+            federal_tax=federal_tax,
+            social_security_tax=ss_tax,
+            medicare_tax=medicare_tax,
+            additional_medicare_tax=additional_medicare_tax,
+            state_tax=state_tax,
+            total_deductions=total_deductions,
+            net_pay=net_pay
         )
     
     def process_1099_payroll(self, contractor: Contractor, hours_worked: float) -> PaystubResult:
@@ -257,14 +448,14 @@ class PayrollCalculator:
         if hours_worked < 0:
             raise PayrollError("Hours worked cannot be negative")
             
-        gross_pay = hours_worked * contractor.pay_rate
+        gross_pay = round(hours_worked * contractor.pay_rate, 2)
         
         return PaystubResult(
             employee_name=contractor.name,
             employee_type="1099 Contractor",
             hours_worked=hours_worked,
-            gross_pay=round(gross_pay, 2),
-            net_pay=round(gross_pay, 2)
+            gross_pay=gross_pay,
+            net_pay=gross_pay
         )
 
 # --- PAYROLL SYSTEM ---
@@ -273,17 +464,41 @@ class PayrollSystem:
     """Main payroll system class that manages employees and processes payroll."""
     
     def __init__(self):
-        self.employees: Dict[str, Employee] = {}
+        self.employees: Dict[int, Employee] = {}
         self.calculator = PayrollCalculator()
-        self.ytd_earnings: Dict[str, float] = {}  # Track YTD earnings by employee ID
+        # YTD earnings column; each employee owns one slot, assigned when first added
+        self._ytd = np.zeros(16, dtype=np.float64)
+        self._slots: Dict[int, int] = {}
+        # Payroll handler per employee ID, chosen once when the employee is added
+        self._dispatch: Dict[int, Callable[[Employee, float], PaystubResult]] = {}
+        self._w2_ids: Set[int] = set()
+        self._contractor_ids: Set[int] = set()
     
-    def add_employee(self, employee: Employee) -> str:
+    def add_employee(self, employee: Employee) -> int:
         """Adds an employee to the system."""
+        if isinstance(employee, W2Employee):
+            handler, cohort = self._process_w2, self._w2_ids
+        elif isinstance(employee, Contractor):
+            handler, cohort = self._process_1099, self._contractor_ids
+        else:
+            raise PayrollError(f"Unknown employee type: {type(employee)}")
+        
+        slot = self._slots.get(employee.id)
+        if slot is None:
+            slot = len(self._slots)
+            if slot == self._ytd.size:
+                # Grow by doubling so adds stay amortized O(1)
+                self._ytd = np.concatenate((self._ytd, np.zeros(self._ytd.size)))
+            self._slots[employee.id] = slot
         self.employees[employee.id] = employee
-        self.ytd_earnings[employee.id] = 0.0
+        self._ytd[slot] = 0.0
+        self._w2_ids.discard(employee.id)
+        self._contractor_ids.discard(employee.id)
+        cohort.add(employee.id)
+        self._dispatch[employee.id] = handler
         return employee.id
     
-    def get_employee(self, employee_id: str) -> Optional[Employee]:
+    def get_employee(self, employee_id: int) -> Optional[Employee]:
         """Retrieves an employee by ID."""
         return self.employees.get(employee_id)
     
@@ -291,50 +506,132 @@ class PayrollSystem:
         """Returns a list of all employees."""
         return list(self.employees.values())
     
-    def process_payroll(self, employee_id: str, hours_worked: float) -> PaystubResult:
+    def get_ytd_earnings(self, employee_id: int) -> float:
+        """Returns an employee's year-to-date gross earnings."""
+        return float(self._ytd[self._slot(employee_id)])
+    
+    def set_ytd_earnings(self, employee_id: int, amount: float):
+        """Overrides an employee's year-to-date gross earnings."""
+        self._ytd[self._slot(employee_id)] = amount
+    
+    def _slot(self, employee_id: int) -> int:
+        slot = self._slots.get(employee_id)
+        if slot is None:
+            raise PayrollError(f"Employee with ID {employee_id} not found")
+        return slot
+    
+    def process_payroll(self, employee_id: int, hours_worked: float) -> PaystubResult:
         """Processes payroll for a specific employee."""
         employee = self.get_employee(employee_id)
         if not employee:
             raise PayrollError(f"Employee with ID {employee_id} not found")
         
-        ytd = self.ytd_earnings.get(employee_id, 0.0)
-        
-        if isinstance(employee, W2Employee):
-            result = self.calculator.process_w2_payroll(employee, hours_worked, ytd)
-        elif isinstance(employee, Contractor):
-            result = self.calculator.process_1099_payroll(employee, hours_worked)
-        else:
-            raise PayrollError(f"Unknown employee type: {type(employee)}")
+        result = self._dispatch[employee_id](employee, hours_worked)
         
         # Update YTD earnings
-        self.ytd_earnings[employee_id] += result.gross_pay
+        self._ytd[self._slots[employee_id]] += result.gross_pay
         
         return result
+    
+    def process_payroll_all(self, hours_worked: Dict[int, float]) -> np.ndarray:
+        """
+        Processes one pay period for every employee in hours_worked (employee ID -> hours).
+        W-2 employees are computed together in a single batch call. Returns a rounded
+        PAYSTUB_DTYPE array in the order of hours_worked; use PaystubResult.from_row
+        for the dataclass view of a row.
+        """
+        w2_rows = []
+        contractor_rows = []
+        for row, employee_id in enumerate(hours_worked):
+            if employee_id in self._w2_ids:
+                w2_rows.append(row)
+            elif employee_id in self._contractor_ids:
+                contractor_rows.append(row)
+            else:
+                raise PayrollError(f"Employee with ID {employee_id} not found")
+        
+        employee_ids = list(hours_worked)
+        rows = np.zeros(len(employee_ids), dtype=PAYSTUB_DTYPE)
+        rows['employee_id'] = employee_ids
+        if w2_rows:
+            w2_employees = [self.employees[employee_ids[row]] for row in w2_rows]
+            batch = PayrollBatch.from_employees(
+                w2_employees, [hours_worked[e.id] for e in w2_employees],
+                self._ytd[[self._slots[e.id] for e in w2_employees]]
+            )
+            w2_results = self.calculator.process_batch(batch)
+            for name in PAYSTUB_AMOUNT_FIELDS:
+                w2_results[name] = _round_cents(w2_results[name])
+            rows[w2_rows] = w2_results
+        if contractor_rows:
+            # Contractors have no withholding: gross is hours * rate and net equals gross
+            contractor_ids = [employee_ids[row] for row in contractor_rows]
+            contractor_hours = np.array([hours_worked[e] for e in contractor_ids], dtype=np.float64)
+            if np.any(contractor_hours < 0):
+                raise PayrollError("Hours worked cannot be negative")
+            pay_rates = np.array([self.employees[e].pay_rate for e in contractor_ids], dtype=np.float64)
+            gross = _round_cents(contractor_hours * pay_rates)
+            rows['hours_worked'][contractor_rows] = contractor_hours
+            rows['gross_pay'][contractor_rows] = gross
+            rows['net_pay'][contractor_rows] = gross
+        
+        # Update YTD earnings; IDs are dict keys, so slots are unique and += is safe
+        slots = np.fromiter((self._slots[e] for e in employee_ids), dtype=np.intp,
+                            count=len(employee_ids))
+        self._ytd[slots] += rows['gross_pay']
+        
+        return rows
+    
+    def _process_w2(self, employee: W2Employee, hours_worked: float) -> PaystubResult:
+        return self.calculator.process_w2_payroll(
+            employee, hours_worked, self._ytd[self._slots[employee.id]]
+        )
+    
+    def _process_1099(self, contractor: Contractor, hours_worked: float) -> PaystubResult:
+        return self.calculator.process_1099_payroll(contractor, hours_worked)
 
-def print_paystub(result: PaystubResult):
-    """Prints a formatted paystub."""
-    print(f"\n{'='*50}")
-    print(f"PAYSTUB: {result.employee_name} ({result.employee_type})")
-    print(f"{'='*50}")
-    print(f"Hours Worked: {result.hours_worked}")
-    print(f"Gross Pay: ${result.gross_pay:,.2f}")
+def _format_paystub(result: PaystubResult) -> str:
+    """Formats a paystub as text, one line per entry, ending in a newline."""
+    lines = [
+        "",
+        f"{'='*50}",
+        f"PAYSTUB: {result.employee_name} ({result.employee_type})",
+        f"{'='*50}",
+        f"Hours Worked: {result.hours_worked}",
+        f"Gross Pay: ${result.gross_pay:,.2f}",
+    ]
     
     if result.employee_type == "W-2 Employee":
-        print(f"\nPre-Tax Deductions: ${result.pre_tax_deductions:,.2f}")
-        print(f"Taxable Income: ${result.taxable_income:,.2f}")
-        print(f"\n--- TAX WITHHOLDINGS ---")
-        print(f"Federal Tax: ${result.federal_tax:,.2f}")
-        print(f"Social Security: ${result.social_security_tax:,.2f}")
-        print(f"Medicare: ${result.medicare_tax:,.2f}")
+        lines += [
+            "",
+            f"Pre-Tax Deductions: ${result.pre_tax_deductions:,.2f}",
+            f"Taxable Income: ${result.taxable_income:,.2f}",
+            "",
+            "--- TAX WITHHOLDINGS ---",
+            f"Federal Tax: ${result.federal_tax:,.2f}",
+            f"Social Security: ${result.social_security_tax:,.2f}",
+            f"Medicare: ${result.medicare_tax:,.2f}",
+        ]
         if result.additional_medicare_tax > 0:
-            print(f"Additional Medicare: ${result.additional_medicare_tax:,.2f}")
-        print(f"State Tax: ${result.state_tax:,.2f}")
-        print(f"\nTotal Deductions: ${result.total_deductions:,.2f}")
+            lines.append(f"Additional Medicare: ${result.additional_medicare_tax:,.2f}")
+        lines += [
+            f"State Tax: ${result.state_tax:,.2f}",
+            "",
+            f"Total Deductions: ${result.total_deductions:,.2f}",
+        ]
     else:
-        print("\nNote: No taxes withheld. Contractor responsible for own taxes.")
+        lines += ["", "Note: No taxes withheld. Contractor responsible for own taxes."]
     
-    print(f"\nNET PAY: ${result.net_pay:,.2f}")
-    print(f"{'='*50}")
+    lines += ["", f"NET PAY: ${result.net_pay:,.2f}", f"{'='*50}", ""]
+    return "\n".join(lines)
+
+def print_paystub(result: PaystubResult):
+    """Prints a formatted paystub."""
+    sys.stdout.write(_format_paystub(result))
+
+def print_paystubs(results: List[PaystubResult]):
+    """Prints formatted paystubs for a whole payroll run with a single write."""
+    sys.stdout.write("".join(map(_format_paystub, results)))
 
 # --- INTERACTIVE DEMO ---
 
@@ -384,7 +681,7 @@ def run_interactive_demo():
         sarah_id = system.add_employee(sarah)
         
         # Set some YTD earnings to demonstrate caps
-        system.ytd_earnings[sarah_id] = 150000  # High YTD to show additional Medicare tax
+        system.set_ytd_earnings(sarah_id, 150000)  # High YTD to show additional Medicare tax
         
         print(f"Added {len(system.employees)} employees to the system\n")
         
@@ -403,7 +700,7 @@ def run_interactive_demo():
             
             # Show updated YTD
             employee = system.get_employee(employee_id)
-            ytd = system.ytd_earnings[employee_id]
+            ytd = system.get_ytd_earnings(employee_id)
             print(f"Updated YTD Earnings: ${ytd:,.2f}")
         
         print(f"\n✅ Demo completed successfully!")
@@ -0,0 +1,203 @@
+from typing import Dict, List, Tuple
+from enum import Enum
+
+import numpy as np
+
+try:
+    from numba import float64, guvectorize, njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; the kernels then run as plain Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# --- 2024 TAX CONSTANTS ---
+
+class FilingStatus(Enum):
+    SINGLE = "Single"
+    MARRIED_JOINTLY = "Married Filing Jointly"
+    MARRIED_SEPARATELY = "Married Filing Separately"
+    HEAD_OF_HOUSEHOLD = "Head of Household"
+
+# 2024 Federal Tax Brackets
+FEDERAL_TAX_BRACKETS = {
+    FilingStatus.SINGLE: [
+        {"limit": 11600, "rate": 0.10},
+        {"limit": 47150, "rate": 0.12},
+        {"limit": 100525, "rate": 0.22},
+        {"limit": 191950, "rate": 0.24},
+        {"limit": 243725, "rate": 0.32},
+        {"limit": 609350, "rate": 0.35},
+        {"limit": float('inf'), "rate": 0.37}
+    ],
+    FilingStatus.MARRIED_JOINTLY: [
+        {"limit": 23200, "rate": 0.10},
+        {"limit": 94300, "rate": 0.12},
+        {"limit": 201050, "rate": 0.22},
+        {"limit": 383900, "rate": 0.24},
+        {"limit": 487450, "rate": 0.32},
+        {"limit": 731200, "rate": 0.35},
+        {"limit": float('inf'), "rate": 0.37}
+    ],
+    FilingStatus.MARRIED_SEPARATELY: [
+        {"limit": 11600, "rate": 0.10},
+        {"limit": 47150, "rate": 0.12},
+        {"limit": 100525, "rate": 0.22},
+        {"limit": 191950, "rate": 0.24},
+        {"limit": 243725, "rate": 0.32},
+        {"limit": 365600, "rate": 0.35},
+        {"limit": float('inf'), "rate": 0.37}
+    ],
+    FilingStatus.HEAD_OF_HOUSEHOLD: [
+        {"limit": 16550, "rate": 0.10},
+        {"limit": 63100, "rate": 0.12},
+        {"limit": 100500, "rate": 0.22},
+        {"limit": 191950, "rate": 0.24},
+        {"limit": 243700, "rate": 0.32},
+        {"limit": 609350, "rate": 0.35},
+        {"limit": float('inf'), "rate": 0.37}
+    ]
+}
+
+def bracket_tables(brackets: List[Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns one filing status's brackets as float64 arrays for bracket_tax_lookup:
+    (upper limits, lower limits, tax owed at each lower limit, rates).
+    """
+    limits = np.array([bracket["limit"] for bracket in brackets], dtype=np.float64)
+    rates = np.array([bracket["rate"] for bracket in brackets], dtype=np.float64)
+    prev_limits = np.concatenate(([0.0], limits[:-1]))
+    cum_tax = np.concatenate(([0.0], np.cumsum(rates[:-1] * (limits[:-1] - prev_limits[:-1]))))
+    return limits, prev_limits, cum_tax, rates
+
+BRACKET_TABLES = {status: bracket_tables(brackets) for status, brackets in FEDERAL_TAX_BRACKETS.items()}
+# The same brackets as parallel float64 arrays of limits and rates
+BRACKET_LIMITS: Dict[FilingStatus, np.ndarray] = {status: tables[0] for status, tables in BRACKET_TABLES.items()}
+BRACKET_RATES: Dict[FilingStatus, np.ndarray] = {status: tables[3] for status, tables in BRACKET_TABLES.items()}
+
+# 2024 Standard Deductions
+STANDARD_DEDUCTIONS = {
+    FilingStatus.SINGLE: 14600,
+    FilingStatus.MARRIED_JOINTLY: 29200,
+    FilingStatus.MARRIED_SEPARATELY: 14600,
+    FilingStatus.HEAD_OF_HOUSEHOLD: 21900
+}
+
+# Integer ids used by the batch kernels in place of FilingStatus members
+FILING_STATUS_IDS = {status: i for i, status in enumerate(FilingStatus)}
+FILING_STATUSES = tuple(FilingStatus)
+
+# FICA tax rates and limits
+SOCIAL_SECURITY_RATE = 0.062
+MEDICARE_RATE = 0.0145
+ADDITIONAL_MEDICARE_RATE = 0.009
+SOCIAL_SECURITY_WAGE_BASE = 168600
+ADDITIONAL_MEDICARE_THRESHOLD = 200000
+
+# --- EXCEPTIONS ---
+class PayrollError(Exception):
+    """Base exception for payroll-related errors."""
+    pass
+
+class InvalidEmployeeDataError(PayrollError):
+    """Raised when employee data is invalid."""
+    pass
+
+# --- NUMERIC KERNELS ---
+
+def bracket_tax_lookup(income: np.ndarray, tables: Tuple[np.ndarray, ...]) -> np.ndarray:
+    """Progressive tax for an array of incomes, given bracket_tables output."""
+    limits, prev_limits, cum_tax, rates = tables
+    i = np.searchsorted(limits, income, side='right')
+    return cum_tax[i] + (income - prev_limits[i]) * rates[i]
+
+@njit(cache=True, error_model='numpy')
+def bracket_tax(income, limits, rates):
+    """Computes progressive tax on income from parallel bracket limit and rate arrays."""
+    # Fixed-trip, branch-free bracket sum: each bracket contributes the part of the
+    # income that falls inside it, clamped to [0, width], so there is no early exit
+    tax = 0.0
+    previous_limit = 0.0
+    for i in range(limits.size):
+        taxable_in_bracket = min(max(income - previous_limit, 0.0), limits[i] - previous_limit)
+        tax += taxable_in_bracket * rates[i]
+        previous_limit = limits[i]
+    return tax
+
+# fastmath is deliberately off: it rewrites the /26 as a reciprocal multiply,
+# which moves federal withholding by a cent on rounding boundaries
+@njit(cache=True, error_model='numpy')
+def w2_kernel(pay_rate, hours, pre_tax, annual_deduction, state_rate, ytd, limits, rates,
+              ss_wage_base, ss_rate, medicare_rate, additional_medicare_threshold, additional_medicare_rate):
+    """
+    Computes one W-2 paycheck (bi-weekly) from plain numbers, bracket arrays and
+    the FICA rates and limits. Returns unrounded (gross, taxable, federal, ss, medicare, additional medicare,
+    state, total deductions).
+    """
+    gross = pay_rate * hours
+    taxable = max(0.0, gross - pre_tax)
+
+    # Federal withholding
+    annual_taxable = max(0.0, taxable * 26 - annual_deduction)
+    federal = bracket_tax(annual_taxable, limits, rates) / 26
+
+    # FICA
+    ss_tax = min(gross, max(0.0, ss_wage_base - ytd)) * ss_rate
+    medicare = gross * medicare_rate
+    additional_medicare = max(0.0, min(gross, ytd + gross - additional_medicare_threshold)) * additional_medicare_rate
+
+    state = taxable * state_rate
+
+    total_tax_deductions = federal + ss_tax + medicare + additional_medicare + state
+    total_deductions = pre_tax + total_tax_deductions
+    return gross, taxable, federal, ss_tax, medicare, additional_medicare, state, total_deductions
+
+try:
+    # Ahead-of-time compiled copy of w2_kernel, produced by build_payroll_ext.py
+    from payroll_native import w2_kernel as _w2_kernel_native
+except ImportError:
+    _w2_kernel_native = None
+
+if _w2_kernel_native is not None:
+    # Python-level entry point for single paychecks
+    w2_paycheck = _w2_kernel_native
+else:
+    w2_paycheck = w2_kernel
+    # Compile up front so the first paycheck does not pay the JIT cost
+    w2_kernel(1.0, 1.0, 0.0, float(STANDARD_DEDUCTIONS[FilingStatus.SINGLE]), 0.0, 0.0,
+              np.array([11600.0, np.inf]), np.array([0.10, 0.12]), float(SOCIAL_SECURITY_WAGE_BASE),
+              SOCIAL_SECURITY_RATE, MEDICARE_RATE, float(ADDITIONAL_MEDICARE_THRESHOLD), ADDITIONAL_MEDICARE_RATE)
+
+_w2_gufunc = None
+
+def get_w2_gufunc():
+    """
+    Returns the parallel W-2 gufunc, or None without numba. It is built on first
+    use because compiling a parallel gufunc cannot be cached and would otherwise
+    dominate import time.
+    """
+    global _w2_gufunc
+    if _w2_gufunc is None and NUMBA_AVAILABLE:
+        # Scalar core dimensions make every employee one element of the ufunc loop,
+        # which the parallel target splits across threads with the GIL released.
+        @guvectorize(
+            [(float64, float64, float64, float64, float64, float64, float64[:], float64[:],
+              float64, float64, float64, float64, float64,
+              float64[:], float64[:], float64[:], float64[:], float64[:], float64[:], float64[:], float64[:])],
+            "(),(),(),(),(),(),(b),(b),(),(),(),(),()->(),(),(),(),(),(),(),()",
+            nopython=True, target='parallel'
+        )
+        def w2_gufunc(pay_rate, hours, pre_tax, annual_deduction, state_rate, ytd, limits, rates,
+                      ss_wage_base, ss_rate, medicare_rate, additional_medicare_threshold, additional_medicare_rate,
+                      gross, taxable, federal, ss_tax, medicare, additional_medicare, state, total_deductions):
+            (gross[0], taxable[0], federal[0], ss_tax[0], medicare[0], additional_medicare[0],
+             state[0], total_deductions[0]) = w2_kernel(
+                pay_rate, hours, pre_tax, annual_deduction, state_rate, ytd, limits, rates,
+                ss_wage_base, ss_rate, medicare_rate, additional_medicare_threshold, additional_medicare_rate
+            )
+
+        _w2_gufunc = w2_gufunc
+    return _w2_gufunc
@@ -1,20 +1,33 @@
 import uuid
 import json
+import math
 import sqlite3
 import os
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Union
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 from enum import Enum
 from datetime import datetime, date
 from decimal import Decimal, ROUND_HALF_UP
 
-# --- ENUMS AND CONSTANTS ---
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is used instead
+    orjson = None
 
-class FilingStatus(Enum):
-    SINGLE = "Single"
-    MARRIED_JOINTLY = "Married Filing Jointly"
-    MARRIED_SEPARATELY = "Married Filing Separately"
-    HEAD_OF_HOUSEHOLD = "Head of Household"
+from payroll_core import (
+    FilingStatus, FEDERAL_TAX_BRACKETS, STANDARD_DEDUCTIONS,
+    FILING_STATUS_IDS, FILING_STATUSES, SOCIAL_SECURITY_RATE, MEDICARE_RATE,
+    ADDITIONAL_MEDICARE_RATE, SOCIAL_SECURITY_WAGE_BASE, ADDITIONAL_MEDICARE_THRESHOLD,
+    PayrollError, InvalidEmployeeDataError, bracket_tables, bracket_tax_lookup
+)
+
+# --- ENUMS AND CONSTANTS ---
 
 class PayFrequency(Enum):
     WEEKLY = ("Weekly", 52)
@@ -24,93 +37,45 @@ class PayFrequency(Enum):
     
     def __init__(self, display_name: str, periods_per_year: int):
         self.display_name = display_name
+        # Per-period amounts divide by this rather than multiply by a cached
+        # reciprocal: x * (1 / n) can differ from x / n in the last bit, which
+        # moves some paychecks by a cent after rounding
         self.periods_per_year = periods_per_year
 
 class State(Enum):
     TEXAS = ("TX", 0.0, 0)  # No state income tax
-    CALIFORNIA = ("CA", 0.10, 5202)  # High tax state
+    # High tax state; complex brackets simplified to a rate for the whole taxable
+    # income, chosen by the (upper limit, rate) tier it falls in
+    CALIFORNIA = ("CA", 0.10, 5202, ((20000, 0.01), (50000, 0.02), (100000, 0.04)))
     FLORIDA = ("FL", 0.0, 0)  # No state income tax
     NEW_YORK = ("NY", 0.085, 8000)  # High tax state
     COLORADO = ("CO", 0.045, 0)  # Flat tax state
     
-    def __init__(self, code: str, max_rate: float, standard_deduction: int):
+    def __init__(self, code: str, max_rate: float, standard_deduction: int,
+                 tiers: Tuple[Tuple[float, float], ...] = ()):
         self.code = code
         self.max_rate = max_rate
         self.standard_deduction = standard_deduction
+        # (limits, rates): taxable income up to limits[i] is taxed at rates[i];
+        # above the last tier the max rate applies
+        self.brackets = (
+            tuple(limit for limit, _ in tiers) + (float('inf'),),
+            tuple(rate for _, rate in tiers) + (max_rate,)
+        )
 
-# 2024 Federal Tax Brackets
-FEDERAL_TAX_BRACKETS = {
-    FilingStatus.SINGLE: [
-        {"limit": 11600, "rate": 0.10},
-        {"limit": 47150, "rate": 0.12},
-        {"limit": 100525, "rate": 0.22},
-        {"limit": 191950, "rate": 0.24},
-        {"limit": 243725, "rate": 0.32},
-        {"limit": 609350, "rate": 0.35},
-        {"limit": float('inf'), "rate": 0.37}
-    ],
-    FilingStatus.MARRIED_JOINTLY: [
-        {"limit": 23200, "rate": 0.10},
-        {"limit": 94300, "rate": 0.12},
-        {"limit": 201050, "rate": 0.22},
-        {"limit": 383900, "rate": 0.24},
-        {"limit": 487450, "rate": 0.32},
-        {"limit": 731200, "rate": 0.35},
-        {"limit": float('inf'), "rate": 0.37}
-    ],
-    FilingStatus.MARRIED_SEPARATELY: [
-        {"limit": 11600, "rate": 0.10},
-        {"limit": 47150, "rate": 0.12},
-        {"limit": 100525, "rate": 0.22},
-        {"limit": 191950, "rate": 0.24},
-        {"limit": 243725, "rate": 0.32},
-        {"limit": 365600, "rate": 0.35},
-        {"limit": float('inf'), "rate": 0.37}
-    ],
-    FilingStatus.HEAD_OF_HOUSEHOLD: [
-        {"limit": 16550, "rate": 0.10},
-        {"limit": 63100, "rate": 0.12},
-        {"limit": 100500, "rate": 0.22},
-        {"limit": 191950, "rate": 0.24},
-        {"limit": 243700, "rate": 0.32},
-        {"limit": 609350, "rate": 0.35},
-        {"limit": float('inf'), "rate": 0.37}
-    ]
-}
-
-# 2024 Standard Deductions
-STANDARD_DEDUCTIONS = {
-    FilingStatus.SINGLE: 14600,
-    FilingStatus.MARRIED_JOINTLY: 29200,
-    FilingStatus.MARRIED_SEPARATELY: 14600,
-    FilingStatus.HEAD_OF_HOUSEHOLD: 21900
-}
-
-# FICA Constants
-SOCIAL_SECURITY_RATE = 0.062
-MEDICARE_RATE = 0.0145
-ADDITIONAL_MEDICARE_RATE = 0.009
-SOCIAL_SECURITY_WAGE_BASE = 168600
-ADDITIONAL_MEDICARE_THRESHOLD = 200000
+STATES = tuple(State)
+STATE_IDS = {state: i for i, state in enumerate(STATES)}
 
 # --- EXCEPTIONS ---
-class PayrollError(Exception):
-    """Base exception for payroll-related errors."""
-    pass
-
-class InvalidEmployeeDataError(PayrollError):
-    """Raised when employee data is invalid."""
-    pass
-
 class DatabaseError(PayrollError):
     """Raised when database operations fail."""
     pass
 
 # --- DATA MODELS ---
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PreTaxDeductions:
-    """Represents pre-tax deductions."""
+    """Represents pre-tax deductions. Immutable, so the total is computed once."""
     health_insurance: float = 0.0
     dental_insurance: float = 0.0
     vision_insurance: float = 0.0
@@ -121,26 +86,38 @@ class PreTaxDeductions:
     parking: float = 0.0
     transit: float = 0.0
     life_insurance: float = 0.0
+    _total: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(
+            self, '_total',
+            self.health_insurance + self.dental_insurance + self.vision_insurance
+            + self.retirement_401k + self.retirement_403b + self.hsa + self.fsa
+            + self.parking + self.transit + self.life_insurance
+        )
     
     def total(self) -> float:
-        return sum([
-            self.health_insurance, self.dental_insurance, self.vision_insurance,
-            self.retirement_401k, self.retirement_403b, self.hsa, self.fsa,
-            self.parking, self.transit, self.life_insurance
-        ])
+        return self._total
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PostTaxDeductions:
-    """Represents post-tax deductions."""
+    """Represents post-tax deductions. Immutable, so the total is computed once."""
     roth_401k: float = 0.0
     union_dues: float = 0.0
     charitable_contributions: float = 0.0
     garnishments: float = 0.0
+    _total: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(
+            self, '_total',
+            self.roth_401k + self.union_dues + self.charitable_contributions + self.garnishments
+        )
     
     def total(self) -> float:
-        return self.roth_401k + self.union_dues + self.charitable_contributions + self.garnishments
+        return self._total
 
-@dataclass
+@dataclass(slots=True)
 class Employee:
     """Base class for all employees."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -153,7 +130,7 @@ class Employee:
         if not self.name.strip():
             raise InvalidEmployeeDataError("Employee name cannot be empty")
 
-@dataclass
+@dataclass(slots=True)
 class W2Employee(Employee):
     """Represents a W-2 employee with comprehensive tax information."""
     pay_rate: float = 0.0
@@ -171,7 +148,8 @@ class W2Employee(Employee):
     is_w2: bool = True
     
     def __post_init__(self):
-        super().__post_init__()
+        # Explicit base call: slots=True rebuilds the class, which breaks zero-argument super()
+        Employee.__post_init__(self)
         if not self.is_salaried and self.pay_rate <= 0:
             raise InvalidEmployeeDataError("Pay rate must be greater than 0 for hourly employees")
         if self.is_salaried and self.salary <= 0:
@@ -179,18 +157,18 @@ class W2Employee(Employee):
         if self.allowances < 0:
             raise InvalidEmployeeDataError("Allowances cannot be negative")
 
-@dataclass
+@dataclass(slots=True)
 class Contractor(Employee):
     """Represents a 1099 contractor."""
     pay_rate: float = 0.0
     is_w2: bool = False
     
     def __post_init__(self):
-        super().__post_init__()
+        Employee.__post_init__(self)
         if self.pay_rate <= 0:
             raise InvalidEmployeeDataError("Pay rate must be greater than 0")
 
-@dataclass
+@dataclass(slots=True)
 class PayrollEntry:
     """Represents a single payroll entry."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -219,18 +197,124 @@ class PayrollEntry:
 
 # --- DATABASE MANAGER ---
 
+# payroll_entries stores one column per PayrollEntry field, in field order
+PAYROLL_ENTRY_COLUMNS = tuple(f.name for f in fields(PayrollEntry))
+_payroll_entry_row = attrgetter(*PAYROLL_ENTRY_COLUMNS)
+
+# Enum members by stored name. Records are written with the bare member name;
+# older records hold str(member), e.g. "PayFrequency.BI_WEEKLY", so both are keys.
+def _members_by_name(enum_cls: type) -> Dict[str, Enum]:
+    return {key: member for member in enum_cls for key in (member.name, str(member))}
+
+_PAY_FREQUENCIES = _members_by_name(PayFrequency)
+_FILING_STATUSES = _members_by_name(FilingStatus)
+_STATES = _members_by_name(State)
+# IDs bound per IN (...) query; SQLite builds before 3.32 allow only 999 parameters
+_MAX_IN_PARAMS = 900
+_INSERT_PAYROLL_ENTRY = f'''
+    INSERT OR REPLACE INTO payroll_entries ({', '.join(PAYROLL_ENTRY_COLUMNS)})
+    VALUES ({', '.join('?' * len(PAYROLL_ENTRY_COLUMNS))})
+'''
+# Hot statements are kept as fixed strings so the connection's statement cache
+# serves them prepared instead of re-parsing the SQL on every call
+_UPSERT_EMPLOYEE = '''
+    INSERT OR REPLACE INTO employees (id, data, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+'''
+_SELECT_EMPLOYEE = 'SELECT data FROM employees WHERE id = ?'
+_SELECT_ALL_EMPLOYEES = 'SELECT data FROM employees'
+# A pay_date range rather than a year extracted from it, so the
+# (employee_id, pay_date) index serves the lookup
+_SELECT_YTD_EARNINGS = '''
+    SELECT COALESCE(SUM(gross_pay), 0.0), COALESCE(SUM(federal_tax), 0.0),
+           COALESCE(SUM(social_security_tax), 0.0),
+           COALESCE(SUM(medicare_tax + additional_medicare_tax), 0.0),
+           COALESCE(SUM(state_tax), 0.0)
+    FROM payroll_entries
+    WHERE employee_id = ? AND pay_date >= ? AND pay_date < ?
+'''
+
+@lru_cache(maxsize=None)
+def _field_plan(cls: type) -> Tuple[Tuple[str, bool, bool], ...]:
+    """
+    Per dataclass: (field name, holds an enum, holds a nested dataclass) for each
+    constructor field. Derived init=False fields are recomputed on load, not stored.
+    """
+    return tuple(
+        (f.name, isinstance(f.type, type) and issubclass(f.type, Enum), is_dataclass(f.type))
+        for f in fields(cls) if f.init
+    )
+
+def _to_plain(record) -> Dict:
+    """Convert a dataclass to a JSON-ready dict without asdict's recursive deep copy."""
+    data = {}
+    for name, is_enum, is_nested in _field_plan(type(record)):
+        value = getattr(record, name)
+        if is_enum and isinstance(value, Enum):
+            value = value.name
+        elif is_nested and is_dataclass(value):
+            value = _to_plain(value)
+        data[name] = value
+    return data
+
+def _json_default(value):
+    # NumPy scalars and arrays (from the batch paths) are stored as plain numbers;
+    # anything else unknown is stored as its str(), as before
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    return str(value)
+
+# orjson would write datetimes in its own ISO format; passing them through to
+# _json_default keeps both encoders writing the same text
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+
+def _record_to_json(record) -> str:
+    """Serialize an employee or payroll entry for storage."""
+    try:
+        if orjson is not None:
+            return orjson.dumps(_to_plain(record), default=_json_default, option=_ORJSON_OPTIONS).decode()
+        return json.dumps(_to_plain(record), default=_json_default)
+    except (TypeError, ValueError) as e:
+        raise DatabaseError(f"Failed to serialize {type(record).__name__}: {e}")
+
+def _json_to_dict(data: str) -> Dict:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 class DatabaseManager:
     """Manages SQLite database operations for persistent storage."""
     
     def __init__(self, db_path: str = "payroll.db"):
         self.db_path = db_path
+        # One connection for the manager's lifetime; each method runs in its own
+        # transaction via `with self._conn`, which needs the default isolation level.
+        # Threads share that connection, and so its transaction, so every block holds
+        # _lock to keep one thread's commit or rollback from taking in another's writes.
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
+            self._conn.executescript('''
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+            ''')
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to open database: {e}")
         self.init_database()
     
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
     def init_database(self):
         """Initialize the database with required tables."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
+                # sqlite3 only opens a transaction implicitly before DML, so without an
+                # explicit BEGIN every CREATE/ALTER/DROP below would commit on its own
+                # and a failed migration could not be rolled back
+                cursor.execute('BEGIN')
                 
                 # Employees table
                 cursor.execute('''
@@ -242,80 +326,117 @@ class DatabaseManager:
                     )
                 ''')
                 
-                # Payroll entries table
+                # Payroll entries table, one column per PayrollEntry field. Databases
+                # from before the columnar layout keep each entry as a JSON blob in a
+                # data column; those rows are moved over once. A payroll_entries_legacy
+                # table left by an interrupted migration is finished the same way.
+                cursor.execute("PRAGMA table_info(payroll_entries)")
+                unmigrated = 'data' in [row[1] for row in cursor.fetchall()]
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'payroll_entries_legacy'"
+                )
+                legacy_entries = cursor.fetchone() is not None
+                if unmigrated:
+                    if legacy_entries:
+                        raise DatabaseError(
+                            "Both payroll_entries and payroll_entries_legacy hold JSON entries; "
+                            "merge them by hand before opening this database"
+                        )
+                    cursor.execute('ALTER TABLE payroll_entries RENAME TO payroll_entries_legacy')
+                    legacy_entries = True
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS payroll_entries (
                         id TEXT PRIMARY KEY,
                         employee_id TEXT NOT NULL,
+                        pay_period_start TEXT,
+                        pay_period_end TEXT,
                         pay_date TEXT NOT NULL,
-                        data TEXT NOT NULL,
+                        hours_worked REAL,
+                        overtime_hours REAL,
+                        gross_pay REAL,
+                        pre_tax_deductions REAL,
+                        taxable_income REAL,
+                        federal_tax REAL,
+                        social_security_tax REAL,
+                        medicare_tax REAL,
+                        additional_medicare_tax REAL,
+                        state_tax REAL,
+                        post_tax_deductions REAL,
+                        total_deductions REAL,
+                        net_pay REAL,
+                        ytd_gross REAL,
+                        ytd_federal_tax REAL,
+                        ytd_social_security_tax REAL,
+                        ytd_medicare_tax REAL,
+                        ytd_state_tax REAL,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         FOREIGN KEY (employee_id) REFERENCES employees (id)
                     )
                 ''')
-                
-                # YTD tracking table
+                if legacy_entries:
+                    cursor.execute(f'''
+                        INSERT INTO payroll_entries ({', '.join(PAYROLL_ENTRY_COLUMNS)}, created_at)
+                        SELECT {', '.join(f"json_extract(data, '$.{column}')" for column in PAYROLL_ENTRY_COLUMNS)}, created_at
+                        FROM payroll_entries_legacy
+                    ''')
+                    cursor.execute('DROP TABLE payroll_entries_legacy')
                 cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS ytd_earnings (
-                        employee_id TEXT PRIMARY KEY,
-                        year INTEGER NOT NULL,
-                        gross_earnings REAL DEFAULT 0.0,
-                        federal_tax_withheld REAL DEFAULT 0.0,
-                        social_security_tax REAL DEFAULT 0.0,
-                        medicare_tax_total REAL DEFAULT 0.0,
-                        state_tax_withheld REAL DEFAULT 0.0,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (employee_id) REFERENCES employees (id)
-                    )
+                    CREATE INDEX IF NOT EXISTS idx_pe_emp_date ON payroll_entries (employee_id, pay_date)
+                ''')
+                # Date-range reports across all employees
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_pe_date ON payroll_entries (pay_date)
                 ''')
-                
-                conn.commit()
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to initialize database: {e}")
     
     def save_employee(self, employee: Employee):
         """Save or update an employee record."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                employee_data = json.dumps(asdict(employee), default=str)
-                cursor.execute('''
-                    INSERT OR REPLACE INTO employees (id, data, updated_at)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
-                ''', (employee.id, employee_data))
-                conn.commit()
+            with self._lock, self._conn as conn:
+                conn.execute(_UPSERT_EMPLOYEE, (employee.id, _record_to_json(employee)))
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to save employee: {e}")
     
+    def save_employees(self, employees: List[Employee]):
+        """Save or update many employee records in one transaction."""
+        try:
+            with self._lock, self._conn as conn:
+                conn.executemany(_UPSERT_EMPLOYEE, ((employee.id, _record_to_json(employee)) for employee in employees))
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to save employees: {e}")
+    
+    def _row_to_employee(self, data: str) -> Employee:
+        """Rebuild an employee from its stored JSON data."""
+        employee_data = _json_to_dict(data)
+        # Reconstruct the appropriate employee type
+        if employee_data.get('is_w2', True):
+            # Convert enum strings back to enum objects
+            if 'pay_frequency' in employee_data:
+                employee_data['pay_frequency'] = _PAY_FREQUENCIES[employee_data['pay_frequency']]
+            if 'filing_status' in employee_data:
+                employee_data['filing_status'] = _FILING_STATUSES[employee_data['filing_status']]
+            if 'state' in employee_data:
+                employee_data['state'] = _STATES[employee_data['state']]
+            
+            # Reconstruct nested objects
+            if 'pre_tax_deductions' in employee_data:
+                employee_data['pre_tax_deductions'] = PreTaxDeductions(**employee_data['pre_tax_deductions'])
+            if 'post_tax_deductions' in employee_data:
+                employee_data['post_tax_deductions'] = PostTaxDeductions(**employee_data['post_tax_deductions'])
+            
+            return W2Employee(**employee_data)
+        else:
+            return Contractor(**employee_data)
+    
     def load_employee(self, employee_id: str) -> Optional[Employee]:
         """Load an employee by ID."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT data FROM employees WHERE id = ?', (employee_id,))
-                result = cursor.fetchone()
+            with self._lock, self._conn as conn:
+                result = conn.execute(_SELECT_EMPLOYEE, (employee_id,)).fetchone()
                 
                 if result:
-                    employee_data = json.loads(result[0])
-                    # Reconstruct the appropriate employee type
-                    if employee_data.get('is_w2', True):
-                        # Convert enum strings back to enum objects
-                        if 'pay_frequency' in employee_data:
-                            employee_data['pay_frequency'] = PayFrequency[employee_data['pay_frequency'].split('.')[1]]
-                        if 'filing_status' in employee_data:
-                            employee_data['filing_status'] = FilingStatus[employee_data['filing_status'].split('.')[1]]
-                        if 'state' in employee_data:
-                            employee_data['state'] = State[employee_data['state'].split('.')[1]]
-                        
-                        # Reconstruct nested objects
-                        if 'pre_tax_deductions' in employee_data:
-                            employee_data['pre_tax_deductions'] = PreTaxDeductions(**employee_data['pre_tax_deductions'])
-                        if 'post_tax_deductions' in employee_data:
-                            employee_data['post_tax_deductions'] = PostTaxDeductions(**employee_data['post_tax_deductions'])
-                        
-                        return W2Employee(**employee_data)
-                    else:
-                        return Contractor(**employee_data)
+                    return self._row_to_employee(result[0])
                 return None
         except (sqlite3.Error, json.JSONDecodeError, KeyError) as e:
             raise DatabaseError(f"Failed to load employee: {e}")
@@ -323,93 +444,89 @@ class DatabaseManager:
     def load_all_employees(self) -> List[Employee]:
         """Load all employees from the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT id FROM employees WHERE 1=1')
-                employee_ids = [row[0] for row in cursor.fetchall()]
-                
-                employees = []
-                for emp_id in employee_ids:
-                    employee = self.load_employee(emp_id)
-                    if employee:
-                        employees.append(employee)
-                
-                return employees
-        except sqlite3.Error as e:
+            with self._lock, self._conn as conn:
+                rows = conn.execute(_SELECT_ALL_EMPLOYEES).fetchall()
+                return [self._row_to_employee(row[0]) for row in rows]
+        except (sqlite3.Error, json.JSONDecodeError, KeyError) as e:
             raise DatabaseError(f"Failed to load employees: {e}")
     
     def save_payroll_entry(self, entry: PayrollEntry):
         """Save a payroll entry."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                entry_data = json.dumps(asdict(entry), default=str)
-                cursor.execute('''
-                    INSERT OR REPLACE INTO payroll_entries (id, employee_id, pay_date, data)
-                    VALUES (?, ?, ?, ?)
-                ''', (entry.id, entry.employee_id, entry.pay_date, entry_data))
-                conn.commit()
+            with self._lock, self._conn as conn:
+                conn.execute(_INSERT_PAYROLL_ENTRY, _payroll_entry_row(entry))
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to save payroll entry: {e}")
     
-    def update_ytd_earnings(self, employee_id: str, year: int, entry: PayrollEntry):
-        """Update YTD earnings for an employee."""
+    def save_payroll_entries(self, entries: List[PayrollEntry]):
+        """Save many payroll entries in one transaction."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO ytd_earnings 
-                    (employee_id, year, gross_earnings, federal_tax_withheld, 
-                     social_security_tax, medicare_tax_total, state_tax_withheld, updated_at)
-                    VALUES (?, ?, 
-                            COALESCE((SELECT gross_earnings FROM ytd_earnings WHERE employee_id = ? AND year = ?), 0) + ?,
-                            COALESCE((SELECT federal_tax_withheld FROM ytd_earnings WHERE employee_id = ? AND year = ?), 0) + ?,
-                            COALESCE((SELECT social_security_tax FROM ytd_earnings WHERE employee_id = ? AND year = ?), 0) + ?,
-                            COALESCE((SELECT medicare_tax_total FROM ytd_earnings WHERE employee_id = ? AND year = ?), 0) + ?,
-                            COALESCE((SELECT state_tax_withheld FROM ytd_earnings WHERE employee_id = ? AND year = ?), 0) + ?,
-                            CURRENT_TIMESTAMP)
-                ''', (
-                    employee_id, year,
-                    employee_id, year, entry.gross_pay,
-                    employee_id, year, entry.federal_tax,
-                    employee_id, year, entry.social_security_tax,
-                    employee_id, year, entry.medicare_tax + entry.additional_medicare_tax,
-                    employee_id, year, entry.state_tax
-                ))
-                conn.commit()
+            with self._lock, self._conn as conn:
+                conn.executemany(_INSERT_PAYROLL_ENTRY, map(_payroll_entry_row, entries))
         except sqlite3.Error as e:
-            raise DatabaseError(f"Failed to update YTD earnings: {e}")
+            raise DatabaseError(f"Failed to save payroll entries: {e}")
     
     def get_ytd_earnings(self, employee_id: str, year: int) -> Dict[str, float]:
-        """Get YTD earnings for an employee."""
+        """Get YTD earnings for an employee, summed from the year's payroll entries."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT gross_earnings, federal_tax_withheld, social_security_tax,
-                           medicare_tax_total, state_tax_withheld
-                    FROM ytd_earnings
-                    WHERE employee_id = ? AND year = ?
-                ''', (employee_id, year))
-                
-                result = cursor.fetchone()
-                if result:
-                    return {
-                        'gross_earnings': result[0],
-                        'federal_tax_withheld': result[1],
-                        'social_security_tax': result[2],
-                        'medicare_tax_total': result[3],
-                        'state_tax_withheld': result[4]
-                    }
+            with self._lock, self._conn as conn:
+                result = conn.execute(
+                    _SELECT_YTD_EARNINGS, (employee_id, f"{year:04d}-01-01", f"{year + 1:04d}-01-01")
+                ).fetchone()
                 return {
-                    'gross_earnings': 0.0,
-                    'federal_tax_withheld': 0.0,
-                    'social_security_tax': 0.0,
-                    'medicare_tax_total': 0.0,
-                    'state_tax_withheld': 0.0
+                    'gross_earnings': result[0],
+                    'federal_tax_withheld': result[1],
+                    'social_security_tax': result[2],
+                    'medicare_tax_total': result[3],
+                    'state_tax_withheld': result[4]
                 }
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to get YTD earnings: {e}")
+    
+    def get_ytd_earnings_bulk(self, employee_ids: List[str], year: int) -> Dict[str, Dict[str, float]]:
+        """
+        Get YTD earnings for many employees with one grouped query per chunk of IDs.
+        Returns a dict keyed by employee ID, shaped like get_ytd_earnings; employees
+        with no entries that year get zeros.
+        """
+        ytd = {
+            employee_id: {
+                'gross_earnings': 0.0,
+                'federal_tax_withheld': 0.0,
+                'social_security_tax': 0.0,
+                'medicare_tax_total': 0.0,
+                'state_tax_withheld': 0.0
+            }
+            for employee_id in employee_ids
+        }
+        ids = list(ytd)
+        try:
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                # Chunked to stay under SQLite's bound-parameter limit
+                for start in range(0, len(ids), _MAX_IN_PARAMS):
+                    chunk = ids[start:start + _MAX_IN_PARAMS]
+                    cursor.execute(f'''
+                        SELECT employee_id, COALESCE(SUM(gross_pay), 0.0), COALESCE(SUM(federal_tax), 0.0),
+                               COALESCE(SUM(social_security_tax), 0.0),
+                               COALESCE(SUM(medicare_tax + additional_medicare_tax), 0.0),
+                               COALESCE(SUM(state_tax), 0.0)
+                        FROM payroll_entries
+                        WHERE employee_id IN ({', '.join('?' * len(chunk))})
+                          AND pay_date >= ? AND pay_date < ?
+                        GROUP BY employee_id
+                    ''', (*chunk, f"{year:04d}-01-01", f"{year + 1:04d}-01-01"))
+                    for employee_id, gross, federal, ss, medicare, state in cursor.fetchall():
+                        ytd[employee_id] = {
+                            'gross_earnings': gross,
+                            'federal_tax_withheld': federal,
+                            'social_security_tax': ss,
+                            'medicare_tax_total': medicare,
+                            'state_tax_withheld': state
+                        }
+            return ytd
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to get YTD earnings: {e}")
 
 # --- ENHANCED PAYROLL CALCULATOR ---
 
@@ -417,23 +534,88 @@ class EnhancedPayrollCalculator:
     """Advanced payroll calculator with comprehensive tax scenarios."""
     
     def __init__(self):
-        self.federal_tax_brackets = FEDERAL_TAX_BRACKETS
         self.standard_deductions = STANDARD_DEDUCTIONS
+        # Withholding is a pure function of its arguments, and salaried employees pass
+        # the same arguments every period, so results are cached per calculator
+        self._federal_withholding_cached = lru_cache(maxsize=8192)(self._federal_withholding)
+        self._state_tax_cached = lru_cache(maxsize=8192)(self._state_tax)
+        self.federal_tax_brackets = FEDERAL_TAX_BRACKETS
+    
+    @property
+    def federal_tax_brackets(self) -> Dict[FilingStatus, List[Dict]]:
+        return self._federal_tax_brackets
+    
+    @federal_tax_brackets.setter
+    def federal_tax_brackets(self, brackets: Dict[FilingStatus, List[Dict]]):
+        # Withholding reads lookup tables derived from the brackets, so assigning new
+        # brackets rebuilds them and drops results cached under the old ones
+        self._federal_tax_brackets = brackets
+        self.clear_caches()
+    
+    def _build_bracket_tables(self):
+        """Derive the bracket lookup tables from federal_tax_brackets."""
+        # Per filing status arrays for the batch lookup, and the same tables as
+        # float tuples for the scalar bisect lookup
+        self._bracket_arrays = {
+            fs: bracket_tables(brackets) for fs, brackets in self._federal_tax_brackets.items()
+        }
+        self._bracket_tables: Dict[FilingStatus, Tuple[Tuple[float, ...], ...]] = {
+            fs: tuple(tuple(table.tolist()) for table in tables) for fs, tables in self._bracket_arrays.items()
+        }
+    
+    def clear_caches(self):
+        """
+        Rebuild the bracket lookup tables and drop cached withholding results; call
+        after changing the tax tables in place. Assigning federal_tax_brackets does
+        this itself.
+        """
+        self._build_bracket_tables()
+        self._federal_withholding_cached.cache_clear()
+        self._state_tax_cached.cache_clear()
     
     def _round_currency(self, amount: float) -> float:
-        """Round to nearest cent."""
+        """Round to nearest cent, half up, as the amount reads in decimal."""
+        cents = amount * 100
+        rounded = math.floor(cents + 0.5)
+        if abs(abs(cents - rounded) - 0.5) > 1e-9 * max(1.0, abs(cents)):
+            return rounded / 100
+        # Within float error of a half cent the binary value cannot tell which way
+        # the decimal amount rounds (e.g. 1.005), so round its decimal form instead
+        return self._round_currency_decimal(amount)
+    
+    def _round_currency_decimal(self, amount: float) -> float:
+        """Round to nearest cent with Decimal ROUND_HALF_UP on str(amount)."""
         return float(Decimal(str(amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
     
+    def _round_currency_array(self, amounts: np.ndarray) -> np.ndarray:
+        """Round an array to the nearest cent, agreeing exactly with _round_currency."""
+        cents = amounts * 100
+        rounded = np.floor(cents + 0.5)
+        result = rounded / 100
+        # Same half-cent guard as _round_currency; those (rare) entries go through Decimal
+        near_half = np.abs(np.abs(cents - rounded) - 0.5) <= 1e-9 * np.maximum(1.0, np.abs(cents))
+        for i in np.flatnonzero(near_half):
+            result[i] = self._round_currency_decimal(float(amounts[i]))
+        return result
+    
     def calculate_federal_withholding(self, taxable_income: float, filing_status: FilingStatus, 
                                     allowances: int, pay_frequency: PayFrequency, 
                                     additional_withholding: float = 0.0, 
                                     is_exempt: bool = False) -> float:
         """Enhanced federal tax withholding calculation."""
+        return self._federal_withholding_cached(
+            taxable_income, filing_status, allowances, pay_frequency, additional_withholding, is_exempt
+        )
+    
+    def _federal_withholding(self, taxable_income: float, filing_status: FilingStatus,
+                             allowances: int, pay_frequency: PayFrequency,
+                             additional_withholding: float, is_exempt: bool) -> float:
         if is_exempt:
             return 0.0
         
         # Annualize the taxable income
-        annual_taxable = taxable_income * pay_frequency.periods_per_year
+        periods = pay_frequency.periods_per_year
+        annual_taxable = taxable_income * periods
         
         # Subtract standard deduction
         standard_deduction = self.standard_deductions[filing_status]
@@ -444,63 +626,40 @@ class EnhancedPayrollCalculator:
         annual_taxable_final = max(0, annual_taxable_after_deduction - allowance_amount)
         
         # Calculate annual tax
-        annual_tax = self._calculate_tax_from_brackets(
-            annual_taxable_final, 
-            self.federal_tax_brackets[filing_status]
-        )
+        annual_tax = self._bracket_tax_fast(annual_taxable_final, filing_status)
         
         # Convert to per-paycheck withholding and add additional withholding
-        per_paycheck_tax = annual_tax / pay_frequency.periods_per_year
+        per_paycheck_tax = annual_tax / periods
         return self._round_currency(per_paycheck_tax + additional_withholding)
     
-    def _calculate_tax_from_brackets(self, income: float, brackets: List[Dict]) -> float:
-        """Calculate tax using progressive brackets."""
-        tax = 0.0
-        income_remaining = income
-        previous_limit = 0
-        
-        for bracket in brackets:
-            limit = bracket["limit"]
-            rate = bracket["rate"]
-            
-            taxable_in_bracket = min(income_remaining, limit - previous_limit)
-            tax += taxable_in_bracket * rate
-            
-            income_remaining -= taxable_in_bracket
-            if income_remaining <= 0:
-                break
-            previous_limit = limit
-        
-        return tax
+    def _bracket_tax_fast(self, income: float, filing_status: FilingStatus) -> float:
+        """Bracket tax by bisecting to the income's bracket and adding the tax below it."""
+        limits, prev_limits, cum_tax, rates = self._bracket_tables[filing_status]
+        i = bisect_right(limits, income)
+        return cum_tax[i] + (income - prev_limits[i]) * rates[i]
     
     def calculate_state_tax(self, taxable_income: float, state: State, 
                           filing_status: FilingStatus, pay_frequency: PayFrequency,
                           is_exempt: bool = False) -> float:
         """Enhanced state tax calculation."""
+        return self._state_tax_cached(taxable_income, state, filing_status, pay_frequency, is_exempt)
+    
+    def _state_tax(self, taxable_income: float, state: State, filing_status: FilingStatus,
+                   pay_frequency: PayFrequency, is_exempt: bool) -> float:
         if is_exempt or state.max_rate == 0:
             return 0.0
         
         # Simplified state tax calculation - in reality this would be much more complex
-        annual_income = taxable_income * pay_frequency.periods_per_year
+        periods = pay_frequency.periods_per_year
+        annual_income = taxable_income * periods
         state_taxable = max(0, annual_income - state.standard_deduction)
         
         # Apply a simplified progressive rate (this would vary significantly by state)
-        if state == State.CALIFORNIA:
-            # California has complex brackets - simplified here
-            if state_taxable <= 20000:
-                rate = 0.01
-            elif state_taxable <= 50000:
-                rate = 0.02
-            elif state_taxable <= 100000:
-                rate = 0.04
-            else:
-                rate = state.max_rate
-        else:
-            # Flat rate for other states
-            rate = state.max_rate
+        limits, rates = state.brackets
+        rate = rates[bisect_left(limits, state_taxable)]
         
         annual_state_tax = state_taxable * rate
-        return self._round_currency(annual_state_tax / pay_frequency.periods_per_year)
+        return self._round_currency(annual_state_tax / periods)
     
     def calculate_fica_taxes(self, gross_pay: float, ytd_earnings: float) -> tuple[float, float, float]:
         """Enhanced FICA tax calculations."""
@@ -597,6 +756,230 @@ class EnhancedPayrollCalculator:
         )
         
         return entry
+    
+    def specialize_for(self, employee: W2Employee) -> Callable[..., PayrollEntry]:
+        """
+        Returns compute(hours_worked, overtime_hours=0.0, ytd_gross=0.0), which gives
+        the same PayrollEntry as process_w2_payroll for this employee. Everything that
+        does not change between pay periods is looked up once, and for salaried
+        employees the taxes other than FICA are computed once. Specialize again after
+        editing the employee or the tax tables.
+        """
+        round_currency = self._round_currency
+        employee_id = employee.id
+        periods = employee.pay_frequency.periods_per_year
+        pay_rate = employee.pay_rate
+        is_salaried = employee.is_salaried
+        pre_tax_total = round_currency(employee.pre_tax_deductions.total())
+        post_tax_total = round_currency(employee.post_tax_deductions.total())
+        
+        # Federal withholding inputs
+        exempt_federal = employee.is_exempt_from_federal
+        standard_deduction = self.standard_deductions[employee.filing_status]
+        allowance_amount = employee.allowances * 4700  # 2024 allowance value
+        additional_withholding = employee.additional_withholding
+        limits, prev_limits, cum_tax, rates = self._bracket_tables[employee.filing_status]
+        
+        # State tax inputs
+        no_state_tax = employee.is_exempt_from_state or employee.state.max_rate == 0
+        state_deduction = employee.state.standard_deduction
+        state_limits, state_rates = employee.state.brackets
+        
+        def income_taxes(taxable_income: float) -> Tuple[float, float]:
+            # Same steps and operation order as calculate_federal_withholding and
+            # calculate_state_tax, so results are identical
+            if exempt_federal:
+                federal_tax = 0.0
+            else:
+                income = max(0, taxable_income * periods - standard_deduction)
+                income = max(0, income - allowance_amount)
+                i = bisect_right(limits, income)
+                annual_tax = cum_tax[i] + (income - prev_limits[i]) * rates[i]
+                federal_tax = round_currency(annual_tax / periods + additional_withholding)
+            if no_state_tax:
+                state_tax = 0.0
+            else:
+                state_taxable = max(0, taxable_income * periods - state_deduction)
+                rate = state_rates[bisect_left(state_limits, state_taxable)]
+                state_tax = round_currency(state_taxable * rate / periods)
+            return federal_tax, state_tax
+        
+        if is_salaried:
+            salaried_gross = round_currency(employee.salary / periods)
+            salaried_taxable = max(0, salaried_gross - pre_tax_total)
+            salaried_taxes = income_taxes(salaried_taxable)
+        
+        def compute(hours_worked: float, overtime_hours: float = 0.0,
+                    ytd_gross: float = 0.0) -> PayrollEntry:
+            if hours_worked < 0 or overtime_hours < 0:
+                raise PayrollError("Hours cannot be negative")
+            
+            if is_salaried:
+                gross_pay = salaried_gross
+                taxable_income = salaried_taxable
+                federal_tax, state_tax = salaried_taxes
+            else:
+                gross_pay = round_currency(hours_worked * pay_rate + overtime_hours * pay_rate * 1.5)
+                taxable_income = max(0, gross_pay - pre_tax_total)
+                federal_tax, state_tax = income_taxes(taxable_income)
+            
+            # FICA, as in calculate_fica_taxes
+            ss_tax = round_currency(
+                min(gross_pay, max(0, SOCIAL_SECURITY_WAGE_BASE - ytd_gross)) * SOCIAL_SECURITY_RATE
+            )
+            medicare_tax = round_currency(gross_pay * MEDICARE_RATE)
+            additional_medicare_tax = 0.0
+            if ytd_gross + gross_pay > ADDITIONAL_MEDICARE_THRESHOLD:
+                excess_wages = min(gross_pay, (ytd_gross + gross_pay) - ADDITIONAL_MEDICARE_THRESHOLD)
+                additional_medicare_tax = round_currency(excess_wages * ADDITIONAL_MEDICARE_RATE)
+            
+            total_tax_deductions = federal_tax + ss_tax + medicare_tax + additional_medicare_tax + state_tax
+            total_deductions = pre_tax_total + total_tax_deductions + post_tax_total
+            today = date.today().isoformat()
+            return PayrollEntry(
+                employee_id=employee_id,
+                pay_period_start=today,
+                pay_period_end=today,
+                pay_date=today,
+                hours_worked=hours_worked,
+                overtime_hours=overtime_hours,
+                gross_pay=gross_pay,
+                pre_tax_deductions=pre_tax_total,
+                taxable_income=taxable_income,
+                federal_tax=federal_tax,
+                social_security_tax=ss_tax,
+                medicare_tax=medicare_tax,
+                additional_medicare_tax=additional_medicare_tax,
+                state_tax=state_tax,
+                post_tax_deductions=post_tax_total,
+                total_deductions=total_deductions,
+                net_pay=round_currency(gross_pay - total_deductions),
+                ytd_gross=ytd_gross + gross_pay
+            )
+        
+        return compute
+    
+    def process_batch(self, employees: List[W2Employee], hours_worked: Sequence[float],
+                      overtime_hours: Optional[Sequence[float]] = None,
+                      ytd_gross: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+        """
+        Vectorized process_w2_payroll for many employees at once. Hours, overtime and
+        YTD gross earnings are parallel to employees. Returns a dict of arrays keyed by
+        PayrollEntry field name, rounded exactly as process_w2_payroll rounds.
+        """
+        n = len(employees)
+        hours = np.asarray(hours_worked, dtype=np.float64)
+        overtime = np.zeros(n) if overtime_hours is None else np.asarray(overtime_hours, dtype=np.float64)
+        ytd = np.zeros(n) if ytd_gross is None else np.asarray(ytd_gross, dtype=np.float64)
+        if np.any(hours < 0) or np.any(overtime < 0):
+            raise PayrollError("Hours cannot be negative")
+        
+        # One pass over the employees into parallel columns
+        columns = np.array([
+            (e.pay_rate, e.salary, e.is_salaried, e.pay_frequency.periods_per_year,
+             FILING_STATUS_IDS[e.filing_status], e.allowances, e.additional_withholding,
+             e.state.max_rate, e.state.standard_deduction, STATE_IDS[e.state],
+             e.pre_tax_deductions.total(), e.post_tax_deductions.total(),
+             e.is_exempt_from_federal, e.is_exempt_from_state)
+            for e in employees
+        ], dtype=np.float64).reshape(n, 14).T
+        (pay_rate, salary, is_salaried, periods, filing_status_ids, allowances, additional_withholding,
+         state_rate, state_deduction, state_ids, pre_tax, post_tax,
+         exempt_federal, exempt_state) = columns
+        round_currency = self._round_currency_array
+        
+        # Gross pay
+        gross_pay = np.where(
+            is_salaried != 0, salary / periods, hours * pay_rate + overtime * pay_rate * 1.5
+        )
+        gross_pay = round_currency(gross_pay)
+        pre_tax_total = round_currency(pre_tax)
+        taxable_income = np.maximum(0.0, gross_pay - pre_tax_total)
+        
+        # Federal withholding, one bracket lookup per filing status present
+        annual_taxable = taxable_income * periods
+        annual_tax = np.zeros(n)
+        for status_id in np.unique(filing_status_ids).astype(np.intp):
+            mask = filing_status_ids == status_id
+            fs = FILING_STATUSES[status_id]
+            income = np.maximum(0.0, annual_taxable[mask] - self.standard_deductions[fs])
+            income = np.maximum(0.0, income - allowances[mask] * 4700)
+            annual_tax[mask] = bracket_tax_lookup(income, self._bracket_arrays[fs])
+        federal_tax = np.where(
+            exempt_federal != 0, 0.0, round_currency(annual_tax / periods + additional_withholding)
+        )
+        
+        # FICA
+        ss_taxable = np.minimum(gross_pay, np.maximum(0.0, SOCIAL_SECURITY_WAGE_BASE - ytd))
+        ss_tax = round_currency(ss_taxable * SOCIAL_SECURITY_RATE)
+        medicare_tax = round_currency(gross_pay * MEDICARE_RATE)
+        excess_wages = np.minimum(gross_pay, ytd + gross_pay - ADDITIONAL_MEDICARE_THRESHOLD)
+        additional_medicare_tax = np.where(
+            ytd + gross_pay > ADDITIONAL_MEDICARE_THRESHOLD,
+            round_currency(excess_wages * ADDITIONAL_MEDICARE_RATE), 0.0
+        )
+        
+        # State tax, one tier lookup per state present
+        state_taxable = np.maximum(0.0, taxable_income * periods - state_deduction)
+        rate = np.zeros(n)
+        for state_id in np.unique(state_ids).astype(np.intp):
+            mask = state_ids == state_id
+            limits, rates = STATES[state_id].brackets
+            rate[mask] = np.asarray(rates)[np.searchsorted(limits, state_taxable[mask], side='left')]
+        state_tax = np.where(
+            (exempt_state != 0) | (state_rate == 0), 0.0, round_currency(state_taxable * rate / periods)
+        )
+        
+        # Totals
+        post_tax_total = round_currency(post_tax)
+        total_tax_deductions = federal_tax + ss_tax + medicare_tax + additional_medicare_tax + state_tax
+        total_deductions = pre_tax_total + total_tax_deductions + post_tax_total
+        net_pay = round_currency(gross_pay - total_deductions)
+        
+        return {
+            'hours_worked': hours,
+            'overtime_hours': overtime,
+            'gross_pay': gross_pay,
+            'pre_tax_deductions': pre_tax_total,
+            'taxable_income': taxable_income,
+            'federal_tax': federal_tax,
+            'social_security_tax': ss_tax,
+            'medicare_tax': medicare_tax,
+            'additional_medicare_tax': additional_medicare_tax,
+            'state_tax': state_tax,
+            'post_tax_deductions': post_tax_total,
+            'total_deductions': total_deductions,
+            'net_pay': net_pay,
+            'ytd_gross': ytd + gross_pay,
+        }
+
+def run_rounding_check():
+    """Check _round_currency and _round_currency_array against Decimal rounding at half cents."""
+    print("🧪 Checking currency rounding...")
+    
+    try:
+        calc = EnhancedPayrollCalculator()
+        
+        # Every x.xx5 amount from -$1,000 to $1,000, where the fast paths' half-cent
+        # guard has to hand off to Decimal
+        amounts = [(k + 5) / 1000 for k in range(-1_000_000, 1_000_000, 10)]
+        # Plus the kind of products payroll rounds: rate * hours, and FICA rates on those
+        rng = np.random.default_rng(0)
+        rates = np.round(rng.uniform(5, 600, 50_000), 2)
+        hours = np.round(rng.uniform(0, 120, 50_000) * 4) / 4
+        gross = rates * hours
+        amounts += gross.tolist() + (gross * SOCIAL_SECURITY_RATE).tolist() + (gross * MEDICARE_RATE).tolist()
+        
+        expected = [calc._round_currency_decimal(amount) for amount in amounts]
+        scalar_misses = sum(calc._round_currency(amount) != want for amount, want in zip(amounts, expected))
+        array_misses = int(np.count_nonzero(calc._round_currency_array(np.array(amounts)) != np.array(expected)))
+        assert scalar_misses == 0, f"_round_currency differs from Decimal on {scalar_misses} amounts"
+        assert array_misses == 0, f"_round_currency_array differs from Decimal on {array_misses} amounts"
+        
+        print(f"✅ Rounding matches Decimal on {len(amounts):,} amounts")
+        
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
 
 # --- REPORT GENERATOR ---
 
@@ -608,7 +991,7 @@ class ReportGenerator:
     
     def generate_paystub_report(self, entry: PayrollEntry, employee: Employee) -> str:
         """Generate a detailed paystub report."""
-        report = f"""
+        parts = [f"""
 {'='*60}
                     EMPLOYEE PAYSTUB
 {'='*60}
@@ -627,22 +1010,22 @@ Gross Pay: ${entry.gross_pay:>15,.2f}
 {'='*60}
                 PRE-TAX DEDUCTIONS
 {'='*60}
-"""
+"""]
         
         if isinstance(employee, W2Employee):
             deductions = employee.pre_tax_deductions
             if deductions.health_insurance > 0:
-                report += f"Health Insurance: ${deductions.health_insurance:>10,.2f}\n"
+                parts.append(f"Health Insurance: ${deductions.health_insurance:>10,.2f}\n")
             if deductions.dental_insurance > 0:
-                report += f"Dental Insurance: ${deductions.dental_insurance:>10,.2f}\n"
+                parts.append(f"Dental Insurance: ${deductions.dental_insurance:>10,.2f}\n")
             if deductions.vision_insurance > 0:
-                report += f"Vision Insurance: ${deductions.vision_insurance:>10,.2f}\n"
+                parts.append(f"Vision Insurance: ${deductions.vision_insurance:>10,.2f}\n")
             if deductions.retirement_401k > 0:
-                report += f"401(k): ${deductions.retirement_401k:>19,.2f}\n"
+                parts.append(f"401(k): ${deductions.retirement_401k:>19,.2f}\n")
             if deductions.hsa > 0:
-                report += f"HSA: ${deductions.hsa:>23,.2f}\n"
+                parts.append(f"HSA: ${deductions.hsa:>23,.2f}\n")
             
-            report += f"""
+            parts.append(f"""
 Total Pre-Tax Deductions: ${entry.pre_tax_deductions:>8,.2f}
 Taxable Income: ${entry.taxable_income:>17,.2f}
 
@@ -651,27 +1034,27 @@ Taxable Income: ${entry.taxable_income:>17,.2f}
 {'='*60}
 Federal Income Tax: ${entry.federal_tax:>13,.2f}
 Social Security Tax: ${entry.social_security_tax:>12,.2f}
-Medicare Tax: ${entry.medicare_tax:>17,.2f}"""
+Medicare Tax: ${entry.medicare_tax:>17,.2f}""")
             
             if entry.additional_medicare_tax > 0:
-                report += f"\nAdditional Medicare Tax: ${entry.additional_medicare_tax:>7,.2f}"
+                parts.append(f"\nAdditional Medicare Tax: ${entry.additional_medicare_tax:>7,.2f}")
             
-            report += f"\nState Income Tax: ${entry.state_tax:>15,.2f}"
+            parts.append(f"\nState Income Tax: ${entry.state_tax:>15,.2f}")
             
             # Post-tax deductions
             post_tax = employee.post_tax_deductions
             if post_tax.total() > 0:
-                report += f"""
+                parts.append(f"""
 
 {'='*60}
                POST-TAX DEDUCTIONS
-{'='*60}"""
+{'='*60}""")
                 if post_tax.roth_401k > 0:
-                    report += f"\nRoth 401(k): ${post_tax.roth_401k:>16,.2f}"
+                    parts.append(f"\nRoth 401(k): ${post_tax.roth_401k:>16,.2f}")
                 if post_tax.union_dues > 0:
-                    report += f"\nUnion Dues: ${post_tax.union_dues:>17,.2f}"
+                    parts.append(f"\nUnion Dues: ${post_tax.union_dues:>17,.2f}")
         
-        report += f"""
+        parts.append(f"""
 
 {'='*60}
                      SUMMARY
@@ -681,9 +1064,9 @@ NET PAY: ${entry.net_pay:>23,.2f}
 
 YTD Gross Earnings: ${entry.ytd_gross:>13,.2f}
 {'='*60}
-"""
+""")
         
-        return report
+        return "".join(parts)
     
     def generate_w2_form(self, employee: W2Employee, year: int) -> str:
         """Generate a simplified W-2 form."""